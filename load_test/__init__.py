@@ -1,10 +1,14 @@
 import asyncio
-from .parse_args import parse, CommandLineArgs
+import json
+from typing import List, Optional
+from .parse_args import parse, parse_compare, CommandLineArgs
 from .util import setup_logging, parse_duration, generate_template_string
 
 from .client import AsyncClient
 from .live_monitor import LiveMonitor
 from .metrics_tracker import MetricsTracker
+from .compare import compare
+from .scenario import Phase, load_scenario
 
 
 async def run_test(
@@ -13,36 +17,67 @@ async def run_test(
     live_monitor: LiveMonitor,
     metrics_tracker: MetricsTracker,
 ):
-    # Convert duration string to timedelta
-    duration = parse_duration(args.duration)
-    end_time = (
-        asyncio.get_running_loop().time() + duration.total_seconds()
-        if duration
-        else None
-    )
-
-    async def perform_request():
+    if args.scenario:
+        phases = load_scenario(args.scenario)
+    else:
+        # Convert duration string to timedelta
+        phases = [
+            Phase(
+                name="main",
+                duration=parse_duration(args.duration),
+                concurrency=args.concurrency_level,
+            )
+        ]
+
+    async def perform_request(phase: Phase):
 
         # Generate a test string or payload here as needed
-        await client.chat_completions(model=args.model)
+        await client.chat_completions(model=args.model, message=phase.prompt())
+
+    async def run_phase(phase: Phase, tasks: set):
+        await metrics_tracker.start_phase(phase.name, phase.warmup)
+
+        loop = asyncio.get_running_loop()
+        start_time = loop.time()
+        end_time = (
+            start_time + phase.duration.total_seconds()
+            if phase.duration is not None
+            else None
+        )
+        # Open-loop phases launch on a schedule, closed-loop phases top up to a concurrency
+        interval = min(1 / phase.rate, 1) if phase.rate else 1
+        launched = 0
+
+        while end_time is None or loop.time() < end_time:
+            if tasks:
+                done, _ = await asyncio.wait(
+                    tasks, timeout=0, return_when=asyncio.FIRST_COMPLETED
+                )
+                tasks.difference_update(done)
+
+            elapsed = loop.time() - start_time
+            if phase.rate:
+                due = int(phase.rate * elapsed) + 1 - launched
+            else:
+                due = phase.concurrency_at(elapsed) - len(tasks)
+
+            for _ in range(max(due, 0)):
+                tasks.add(asyncio.create_task(perform_request(phase)))
+                launched += 1
+
+            # Adjust as necessary to manage load
+            if end_time is None:
+                await asyncio.sleep(interval)
+            else:
+                await asyncio.sleep(max(min(interval, end_time - loop.time()), 0))
 
     async def manage_requests():
+        # Requests still in flight at a phase boundary carry over and finish
+        # against the phase they started in
         tasks = set()
         try:
-            while end_time is None or asyncio.get_running_loop().time() < end_time:
-                if tasks:
-                    done, _ = await asyncio.wait(
-                        tasks, timeout=0, return_when=asyncio.FIRST_COMPLETED
-                    )
-                    tasks.difference_update(done)
-
-                while len(tasks) < args.concurrency_level and (
-                    end_time is None or asyncio.get_running_loop().time() < end_time
-                ):
-                    task = asyncio.create_task(perform_request())
-                    tasks.add(task)
-
-                await asyncio.sleep(1)  # Adjust as necessary to manage load
+            for phase in phases:
+                await run_phase(phase, tasks)
         finally:
             for task in tasks:
                 task.cancel()
@@ -61,7 +96,9 @@ async def main_async():
     logger, log_file = setup_logging()
 
     # Initialize the metrics tracker
-    metrics_tracker = MetricsTracker()
+    metrics_tracker = MetricsTracker(
+        slo_latency=args.slo_latency, slo_ttft=args.slo_ttft
+    )
 
     # Initialize the API client
     client = AsyncClient(
@@ -73,6 +110,10 @@ async def main_async():
         tiktoken_encoding=args.tiktoken,
         client_type=args.client_type,
         api_version=args.api_version,
+        stream=args.stream,
+        stream_usage=args.stream_usage,
+        fast_path=args.fast_path,
+        unbounded_pool=args.unbounded_pool,
     )
 
     # Initialize and start the live monitoring
@@ -83,3 +124,34 @@ async def main_async():
 
     # Final update to the live monitor
     await live_monitor.final_update()
+
+    if args.output:
+        summary = dict(
+            await metrics_tracker.get_metrics(),
+            phases=await metrics_tracker.get_phase_metrics(),
+        )
+        with open(args.output, "w") as f:
+            json.dump(summary, f, indent=2, default=float)
+
+
+def compare_main(argv: Optional[List[str]] = None) -> int:
+    args = parse_compare(argv)
+
+    thresholds = {
+        "p50": args.max_latency_regression,
+        "p90": args.max_latency_regression,
+        "p99": args.max_latency_regression,
+        "ttft_p50": args.max_ttft_regression,
+        "ttft_p90": args.max_ttft_regression,
+        "requests_per_minute": args.max_throughput_drop,
+        "tokens_per_minute": args.max_throughput_drop,
+        "error_rate": args.max_error_rate_increase,
+    }
+
+    return compare(
+        args.runs,
+        thresholds,
+        iterations=args.bootstrap_iterations,
+        confidence=args.confidence,
+        seed=args.seed,
+    )
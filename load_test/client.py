@@ -1,6 +1,7 @@
 import httpx
-from typing import Dict, Any, Optional, Literal
+from typing import Dict, Any, List, NamedTuple, Optional, Literal
 from openai import AsyncOpenAI, AsyncAzureOpenAI, APIStatusError, APIError
+from openai._constants import DEFAULT_LIMITS, DEFAULT_TIMEOUT
 from .metrics_tracker import MetricsTracker
 import tiktoken
 import time
@@ -8,6 +9,7 @@ from logging import Logger
 import uuid
 import json
 from .util import random_prompt
+from .fast_client import FastClient
 
 try:
     from .custom_handler import CustomClient
@@ -15,6 +17,13 @@ except ImportError:
     CustomClient = None
 
 
+class Completion(NamedTuple):
+    prompt_tokens: int
+    completion_tokens: int
+    finish_reason: Optional[str]
+    ttft: Optional[float]
+
+
 class AsyncClient:
     def __init__(
         self,
@@ -26,28 +35,45 @@ class AsyncClient:
         api_version: str = "2024-02-01",
         client_type: Literal["azure", "openai", "custom"] = "azure",
         tiktoken_encoding: str = "cl100k_base",
+        stream: bool = False,
+        stream_usage: bool = True,
+        fast_path: bool = False,
+        unbounded_pool: bool = False,
     ) -> None:
         self.endpoint = endpoint
         self.api_key = api_key
         self.api_version = api_version
         self.max_tokens = max_tokens
+        self.stream = stream
+        self.stream_usage = stream_usage
         self.metrics_tracker = metrics_tracker
         if tiktoken_encoding not in tiktoken.list_encoding_names():
             raise ValueError(f"Unsupported TikToken encoding: {tiktoken_encoding}")
         self.tiktoken = tiktoken.get_encoding(tiktoken_encoding)
         self.logger = logger
         self.client_type = client_type
+        # One pool shared by the SDK and the fast path, configured like the
+        # SDK's own so both paths queue on the same connection limits
+        limits = DEFAULT_LIMITS
+        if unbounded_pool:
+            limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+        self.http_client = httpx.AsyncClient(
+            limits=limits, timeout=DEFAULT_TIMEOUT, follow_redirects=True
+        )
+        self.fast_client = None
         match client_type:
             case "azure":
                 self.client = AsyncAzureOpenAI(
                     base_url=self.endpoint,
                     api_key=self.api_key,
                     api_version=self.api_version,
+                    http_client=self.http_client,
                 )
             case "openai":
                 self.client = AsyncOpenAI(
                     base_url=self.endpoint,
                     api_key=self.api_key,
+                    http_client=self.http_client,
                 )
             case "custom":
                 if CustomClient is None:
@@ -60,85 +86,233 @@ class AsyncClient:
             case default:
                 raise ValueError(f"Unsupported client type: {client_type}")
 
+        if fast_path:
+            if client_type == "custom":
+                raise ValueError("The fast path is not supported by the custom client.")
+            self.fast_client = FastClient(
+                http_client=self.http_client,
+                endpoint=self.endpoint,
+                api_key=self.api_key,
+                client_type=client_type,
+                api_version=self.api_version,
+                max_tokens=self.max_tokens,
+                stream=self.stream,
+                stream_usage=self.stream_usage,
+            )
+
+    async def sdk_completion(
+        self, model: str, message: str, start_time: float
+    ) -> Completion:
+        messages = [{"role": "user", "content": message}]
+        if not self.stream:
+            response = await self.client.chat.completions.create(
+                model=model,
+                messages=messages,
+                max_tokens=self.max_tokens,
+            )
+            return Completion(
+                prompt_tokens=response.usage.prompt_tokens,
+                completion_tokens=response.usage.completion_tokens,
+                finish_reason=response.choices[0].finish_reason,
+                ttft=None,
+            )
+
+        response = await self.client.chat.completions.create(
+            model=model,
+            messages=messages,
+            max_tokens=self.max_tokens,
+            stream=True,
+            extra_body=(
+                {"stream_options": {"include_usage": True}}
+                if self.stream_usage
+                else None
+            ),
+        )
+
+        ttft = None
+        content = []
+        usage = None
+        finish_reason = None
+        async for chunk in response:
+            # The usage chunk and Azure's content filter chunk have no choices
+            if getattr(chunk, "usage", None):
+                usage = chunk.usage
+            for choice in chunk.choices:
+                if choice.delta and choice.delta.content:
+                    if ttft is None:
+                        ttft = time.perf_counter() - start_time
+                    content.append(choice.delta.content)
+                if choice.finish_reason:
+                    finish_reason = choice.finish_reason
+
+        return self.build_completion(usage, message, content, finish_reason, ttft)
+
+    async def fast_completion(
+        self, model: str, message: str, start_time: float
+    ) -> Completion:
+        usage, content, finish_reason, ttft = await self.fast_client.chat_completions(
+            model, message, start_time
+        )
+        return self.build_completion(usage, message, content, finish_reason, ttft)
+
+    # Falls back to the local tokenizer when the API does not report usage
+    def build_completion(
+        self,
+        usage: Optional[Any],
+        message: str,
+        content: List[str],
+        finish_reason: Optional[str],
+        ttft: Optional[float],
+    ) -> Completion:
+        if isinstance(usage, dict):
+            prompt_tokens = usage["prompt_tokens"]
+            completion_tokens = usage["completion_tokens"]
+        elif usage is not None:
+            prompt_tokens = usage.prompt_tokens
+            completion_tokens = usage.completion_tokens
+        else:
+            prompt_tokens = len(self.tiktoken.encode(message))
+            completion_tokens = len(self.tiktoken.encode("".join(content)))
+
+        return Completion(
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            finish_reason=finish_reason,
+            ttft=ttft,
+        )
+
+    async def custom_completion(self, model: str, message: str) -> Completion:
+        response = await self.client.custom_request_handler(
+            model, message, self.max_tokens
+        )
+        return Completion(
+            prompt_tokens=len(self.tiktoken.encode(message)),
+            completion_tokens=self.client.custom_response_handler(response),
+            finish_reason=None,
+            ttft=None,
+        )
+
     async def chat_completions(
         self,
         model: str,
+        message: Optional[str] = None,
     ) -> Dict[str, Any]:
-        message = random_prompt()
-        payload = {
-            "model": model,
-            "messages": [{"role": "user", "content": message}],
-            "max_tokens": self.max_tokens,
-        }
-        msg_token_count = len(self.tiktoken.encode(message))
-        await self.metrics_tracker.update_metric("total_input_tokens", msg_token_count)
+        message = message or random_prompt()
+        phase = self.metrics_tracker.phase
         id = str(uuid.uuid4())
 
         log_req_message = {
             "type": "request",
             "id": id,
-            "payload": payload,
-            "token_count": msg_token_count,
-            "timestamp": time.time(),
+            "phase": phase,
+            "warmup": self.metrics_tracker.window.warmup,
         }
+        if self.fast_client is not None:
+            # Token counts come from the response, so the fast path neither
+            # tokenizes nor logs the prompt to keep per-request work low
+            log_req_message.update(model=model, max_tokens=self.max_tokens)
+        else:
+            log_req_message.update(
+                payload={
+                    "model": model,
+                    "messages": [{"role": "user", "content": message}],
+                    "max_tokens": self.max_tokens,
+                },
+                token_count=len(self.tiktoken.encode(message)),
+            )
+        log_req_message["timestamp"] = time.time()
 
         self.logger.info(json.dumps(log_req_message))
 
         start_time = time.perf_counter()
 
         try:
-            await self.metrics_tracker.update_metric("active_calls", 1)
+            await self.metrics_tracker.update_metric("active_calls", 1, phase)
 
             if self.client_type == "custom":
-                response = await self.client.custom_request_handler(
-                    model, message, self.max_tokens
-                )
+                completion = await self.custom_completion(model, message)
+            elif self.fast_client is not None:
+                completion = await self.fast_completion(model, message, start_time)
             else:
-                response = await self.client.chat.completions.create(
-                    model=payload["model"],
-                    messages=payload["messages"],
-                    max_tokens=payload["max_tokens"],
-                )
+                completion = await self.sdk_completion(model, message, start_time)
 
             end_time = time.perf_counter()
             response_time = end_time - start_time
 
-            await self.metrics_tracker.update_metric("avg_response_time", response_time)
+            await self.metrics_tracker.update_metric(
+                "avg_response_time", response_time, phase
+            )
 
-            token_count = (
-                response.usage.total_tokens
-                if self.client_type != "custom"
-                else self.client.custom_response_handler(response)
+            for token_count in completion[:2]:
+                if type(token_count) != int:
+                    raise ValueError(
+                        f"Unsupported token count type: {type(token_count)}"
+                    )
+
+            token_count = completion.prompt_tokens + completion.completion_tokens
+            await self.metrics_tracker.update_metric(
+                "total_input_tokens", completion.prompt_tokens, phase
+            )
+            await self.metrics_tracker.update_metric(
+                "total_output_tokens", completion.completion_tokens, phase
+            )
+            await self.metrics_tracker.update_metric(
+                "total_token_count", token_count, phase
             )
 
-            if type(token_count) != int:
-                raise ValueError(f"Unsupported token count type: {type(token_count)}")
+            if completion.ttft is not None:
+                await self.metrics_tracker.update_metric(
+                    "avg_ttft", completion.ttft, phase
+                )
 
-            await self.metrics_tracker.update_metric("total_token_count", token_count)
+            # Without streaming the first token arrives with the whole response
+            if self.metrics_tracker.has_slo and self.metrics_tracker.meets_slo(
+                response_time, completion.ttft or response_time
+            ):
+                await self.metrics_tracker.update_metric("good_calls", 1, phase)
+                await self.metrics_tracker.update_metric(
+                    "good_token_count", token_count, phase
+                )
 
             log_res_message = {
                 "type": "response",
                 "id": id,
                 "response_time": response_time,
+                "ttft": completion.ttft,
                 "token_count": token_count,
+                "prompt_tokens": completion.prompt_tokens,
+                "completion_tokens": completion.completion_tokens,
+                "finish_reason": completion.finish_reason,
                 "timestamp": time.time(),
             }
             self.logger.info(json.dumps(log_res_message))
 
-        except (httpx.HTTPStatusError, APIError) as e:
+        except (httpx.HTTPError, APIError) as e:
+            # Connection errors, timeouts, dropped streams and mid-stream error
+            # events carry no response
+            response = getattr(e, "response", None)
+            status_code = response.status_code if response is not None else None
+            if response is not None:
+                try:
+                    response_body = response.json()
+                except ValueError:
+                    response_body = response.text
+            else:
+                response_body = None
 
-            if e.response.status_code == 429:
+            if status_code == 429:
                 # Rate limit exceeded
-                await self.metrics_tracker.update_metric("rate_limit_calls", 1)
-            await self.metrics_tracker.update_metric("unsuccessful_calls", 1)
+                await self.metrics_tracker.update_metric("rate_limit_calls", 1, phase)
+            await self.metrics_tracker.update_metric("unsuccessful_calls", 1, phase)
             log_err_message = {
                 "type": "error",
                 "id": id,
-                "status_code": e.response.status_code,
-                "response": e.response.json(),
+                "status_code": status_code,
+                "response": response_body,
+                "message": str(e),
                 "timestamp": time.time(),
             }
             self.logger.error(json.dumps(log_err_message))
         finally:
-            await self.metrics_tracker.update_metric("active_calls", -1)
-            await self.metrics_tracker.update_metric("total_calls", 1)
+            await self.metrics_tracker.update_metric("active_calls", -1, phase)
+            await self.metrics_tracker.update_metric("total_calls", 1, phase)
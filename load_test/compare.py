@@ -0,0 +1,329 @@
+import json
+import math
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+import numpy as np
+from rich.console import Console
+from rich.table import Table
+
+
+class Metric(NamedTuple):
+    name: str
+    samples: str
+    statistic: Callable[[np.ndarray], float]
+    higher_is_worse: bool
+
+
+METRICS: List[Metric] = [
+    Metric("requests_per_minute", "completions", lambda x: np.mean(x) * 60, False),
+    Metric("tokens_per_minute", "tokens", lambda x: np.mean(x) * 60, False),
+    Metric("p50", "response_times", lambda x: np.percentile(x, 50), True),
+    Metric("p90", "response_times", lambda x: np.percentile(x, 90), True),
+    Metric("p99", "response_times", lambda x: np.percentile(x, 99), True),
+    Metric("ttft_p50", "ttfts", lambda x: np.percentile(x, 50), True),
+    Metric("ttft_p90", "ttfts", lambda x: np.percentile(x, 90), True),
+    Metric("error_rate", "outcomes", lambda x: np.mean(x), True),
+]
+
+
+# Exit codes: a breached threshold, a run that could not be loaded (shared with
+# argparse usage errors), and a threshold that could not be evaluated
+EXIT_REGRESSION = 1
+EXIT_LOAD_ERROR = 2
+EXIT_MISSING_DATA = 3
+
+
+class RunResults(NamedTuple):
+    name: str
+    # Per-request samples keyed by Metric.samples, empty when loaded from a summary
+    samples: Dict[str, np.ndarray]
+    # Point values keyed by Metric.name, only set when loaded from a summary
+    summary: Dict[str, float]
+
+    def value(self, metric: Metric) -> Optional[float]:
+        if self.summary:
+            return self.summary.get(metric.name)
+        samples = self.samples.get(metric.samples)
+        if samples is None or len(samples) == 0:
+            return None
+        return float(metric.statistic(samples))
+
+
+class Comparison(NamedTuple):
+    metric: Metric
+    baseline: float
+    candidate: float
+    change_pct: Optional[float]
+    ci_low: Optional[float]
+    ci_high: Optional[float]
+    breached: bool
+
+
+# The log format is "%(asctime)s - %(levelname)s - %(message)s" with a JSON message
+def load_log(path: str) -> RunResults:
+    request_times: List[float] = []
+    finish_times: List[float] = []
+    response_times: List[float] = []
+    ttfts: List[float] = []
+    tokens: List[int] = []
+    outcomes: List[int] = []
+    warmup_ids = set()
+
+    with open(path) as f:
+        for line in f:
+            parts = line.rstrip("\n").split(" - ", 2)
+            if len(parts) != 3:
+                continue
+            try:
+                record = json.loads(parts[2])
+            except json.JSONDecodeError:
+                continue
+            if not isinstance(record, dict):
+                continue
+
+            # Warm-up requests are excluded, matching the headline metrics
+            if record.get("warmup"):
+                warmup_ids.add(record.get("id"))
+                continue
+            if record.get("id") in warmup_ids:
+                continue
+
+            try:
+                match record.get("type"):
+                    case "request":
+                        request_times.append(float(record["timestamp"]))
+                    case "response":
+                        finish_times.append(float(record["timestamp"]))
+                        response_times.append(float(record["response_time"]))
+                        tokens.append(int(record["token_count"]))
+                        outcomes.append(0)
+                        if record.get("ttft") is not None:
+                            ttfts.append(float(record["ttft"]))
+                    case "error":
+                        outcomes.append(1)
+            except (KeyError, TypeError) as e:
+                raise ValueError(
+                    f"Malformed {record.get('type')} record in {path}"
+                ) from e
+
+    if not request_times:
+        raise ValueError(f"No request records found in {path}")
+
+    # Throughput is resampled over one-second buckets of completed requests
+    start = min(request_times)
+    seconds = (np.asarray(finish_times) - start).astype(int)
+    buckets = max(int(math.ceil(max(finish_times, default=start) - start)), 1)
+
+    return RunResults(
+        name=path,
+        samples={
+            "response_times": np.asarray(response_times, dtype=float),
+            "ttfts": np.asarray(ttfts, dtype=float),
+            "completions": np.bincount(seconds, minlength=buckets).astype(float),
+            "tokens": np.bincount(seconds, weights=tokens, minlength=buckets).astype(
+                float
+            ),
+            "outcomes": np.asarray(outcomes, dtype=float),
+        },
+        summary={},
+    )
+
+
+def load_summary(path: str) -> RunResults:
+    with open(path) as f:
+        metrics: Dict[str, Any] = json.load(f)
+    if not isinstance(metrics, dict):
+        raise ValueError(f"{path} is not a metrics summary")
+
+    try:
+        summary = {
+            metric.name: float(metrics[metric.name])
+            for metric in METRICS
+            if metrics.get(metric.name) is not None
+        }
+        finished = metrics.get("successful_calls", 0) + metrics.get(
+            "unsuccessful_calls", 0
+        )
+        if finished:
+            summary["error_rate"] = metrics.get("unsuccessful_calls", 0) / finished
+    except TypeError as e:
+        raise ValueError(f"Malformed metrics summary in {path}") from e
+
+    return RunResults(name=path, samples={}, summary=summary)
+
+
+def is_summary(path: str) -> bool:
+    return path.endswith(".json")
+
+
+def load_run(path: str) -> RunResults:
+    if is_summary(path):
+        return load_summary(path)
+    return load_log(path)
+
+
+def bootstrap_change(
+    metric: Metric,
+    baseline: np.ndarray,
+    candidate: np.ndarray,
+    iterations: int,
+    confidence: float,
+    rng: np.random.Generator,
+) -> tuple[float, float]:
+    changes = np.empty(iterations)
+    for i in range(iterations):
+        base = metric.statistic(rng.choice(baseline, size=len(baseline)))
+        cand = metric.statistic(rng.choice(candidate, size=len(candidate)))
+        changes[i] = change(metric, base, cand)
+
+    changes = changes[np.isfinite(changes)]
+    if len(changes) == 0:
+        return math.nan, math.nan
+
+    alpha = (1 - confidence) / 2
+    low, high = np.percentile(changes, [alpha * 100, (1 - alpha) * 100])
+    return float(low), float(high)
+
+
+# Error rate is compared in absolute percentage points, everything else relatively
+def change(metric: Metric, baseline: float, candidate: float) -> float:
+    if metric.name == "error_rate":
+        return (candidate - baseline) * 100
+    if baseline == 0:
+        return math.nan
+    return (candidate - baseline) / baseline * 100
+
+
+def compare_runs(
+    baseline: RunResults,
+    candidate: RunResults,
+    thresholds: Dict[str, Optional[float]],
+    iterations: int = 1000,
+    confidence: float = 0.95,
+    seed: Optional[int] = None,
+) -> List[Comparison]:
+    rng = np.random.default_rng(seed)
+    comparisons = []
+
+    for metric in METRICS:
+        base_value = baseline.value(metric)
+        cand_value = candidate.value(metric)
+        if base_value is None or cand_value is None:
+            continue
+
+        change_pct = change(metric, base_value, cand_value)
+        change_pct = None if math.isnan(change_pct) else change_pct
+
+        ci_low = ci_high = None
+        if not baseline.summary and not candidate.summary:
+            ci_low, ci_high = bootstrap_change(
+                metric,
+                baseline.samples[metric.samples],
+                candidate.samples[metric.samples],
+                iterations,
+                confidence,
+                rng,
+            )
+            if math.isnan(ci_low):
+                ci_low = ci_high = None
+
+        # A regression is only flagged once it crosses the threshold and the
+        # confidence interval (when available) rules out no change at all
+        breached = False
+        threshold = thresholds.get(metric.name)
+        if threshold is not None and change_pct is not None:
+            regression = change_pct if metric.higher_is_worse else -change_pct
+            significant = ci_low is None or (
+                ci_low > 0 if metric.higher_is_worse else ci_high < 0
+            )
+            breached = regression > threshold and significant
+
+        comparisons.append(
+            Comparison(
+                metric=metric,
+                baseline=base_value,
+                candidate=cand_value,
+                change_pct=change_pct,
+                ci_low=ci_low,
+                ci_high=ci_high,
+                breached=breached,
+            )
+        )
+
+    return comparisons
+
+
+def create_table(
+    baseline: RunResults, candidate: RunResults, comparisons: List[Comparison]
+) -> Table:
+    table = Table(
+        title=f"{candidate.name} vs {baseline.name}",
+        show_header=True,
+        header_style="bold magenta",
+    )
+    table.add_column("Metric", style="dim", width=20)
+    table.add_column("Baseline")
+    table.add_column("Candidate")
+    table.add_column("Change")
+    table.add_column("CI")
+    table.add_column("Status")
+
+    for c in comparisons:
+        unit = "pp" if c.metric.name == "error_rate" else "%"
+        change_str = "-" if c.change_pct is None else f"{c.change_pct:+.2f}{unit}"
+        ci_str = (
+            "-"
+            if c.ci_low is None
+            else f"[{c.ci_low:+.2f}{unit}, {c.ci_high:+.2f}{unit}]"
+        )
+        status = "[red]REGRESSION[/red]" if c.breached else "[green]ok[/green]"
+        table.add_row(
+            c.metric.name.replace("_", " ").title(),
+            f"{c.baseline:.3f}",
+            f"{c.candidate:.3f}",
+            change_str,
+            ci_str,
+            status,
+        )
+
+    return table
+
+
+def compare(
+    paths: List[str],
+    thresholds: Dict[str, Optional[float]],
+    iterations: int = 1000,
+    confidence: float = 0.95,
+    seed: Optional[int] = None,
+    console: Optional[Console] = None,
+) -> int:
+    console = console or Console()
+    # Unreadable inputs get their own exit code so a gate can tell them from a regression
+    try:
+        baseline, *candidates = [load_run(path) for path in paths]
+    except (OSError, ValueError) as e:
+        console.print(f"[red]Error: could not load run: {e}[/red]")
+        return EXIT_LOAD_ERROR
+
+    breached = False
+    missing = False
+    for candidate in candidates:
+        comparisons = compare_runs(
+            baseline, candidate, thresholds, iterations, confidence, seed
+        )
+        console.print(create_table(baseline, candidate, comparisons))
+        breached = breached or any(c.breached for c in comparisons)
+
+        # A gate without data must fail rather than silently pass
+        evaluated = {c.metric.name for c in comparisons if c.change_pct is not None}
+        for name, threshold in thresholds.items():
+            if threshold is not None and name not in evaluated:
+                console.print(
+                    f"[yellow]Warning: no {name} data to check its threshold "
+                    f"for {candidate.name} vs {baseline.name}[/yellow]"
+                )
+                missing = True
+
+    if breached:
+        return EXIT_REGRESSION
+    return EXIT_MISSING_DATA if missing else 0
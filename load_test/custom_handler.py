@@ -43,7 +43,8 @@ class CustomClient:
         return response
 
     def custom_response_handler(self, response: httpx.Response) -> int:
-        # Replace with the actual response processing logic for the custom API. must return token count
+        # Replace with the actual response processing logic for the custom API. must return the completion token count,
+        # the prompt token count falls back to the local TikToken count of the message
 
         result = response.json()
         output = result["output"]
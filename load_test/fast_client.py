@@ -0,0 +1,195 @@
+import asyncio
+import json
+import random
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+from openai import APIConnectionError, APIError, APITimeoutError
+
+try:
+    import orjson
+
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
+
+# Retry behaviour mirrors the OpenAI SDK defaults so both paths are comparable
+MAX_RETRIES = 2
+INITIAL_RETRY_DELAY = 0.5
+MAX_RETRY_DELAY = 8.0
+
+PLACEHOLDER = "\x00message\x00"
+
+Parsed = Tuple[Optional[Dict[str, Any]], List[str], Optional[str], Optional[float]]
+
+
+class FastClient:
+    # Posts pre-serialised chat completion bodies over a shared httpx pool and
+    # only parses usage, finish reason and streamed content from the response
+    def __init__(
+        self,
+        http_client: httpx.AsyncClient,
+        endpoint: str,
+        api_key: str,
+        client_type: str,
+        api_version: str,
+        max_tokens: Optional[int] = None,
+        stream: bool = False,
+        stream_usage: bool = True,
+    ) -> None:
+        self.http_client = http_client
+        self.endpoint = endpoint.rstrip("/")
+        self.azure = client_type == "azure"
+        self.max_tokens = max_tokens
+        self.stream = stream
+        self.stream_usage = stream_usage
+        self.headers = {
+            "Content-Type": "application/json",
+            "Accept": "application/json",
+        }
+        if self.azure:
+            self.headers["api-key"] = api_key
+            self.params = {"api-version": api_version}
+        else:
+            self.headers["Authorization"] = f"Bearer {api_key}"
+            self.params = {}
+        self.templates: Dict[str, Tuple[bytes, bytes, str]] = {}
+
+    def template(self, model: str) -> Tuple[bytes, bytes, str]:
+        template = self.templates.get(model)
+        if template is None:
+            payload = {
+                "model": model,
+                "messages": [{"role": "user", "content": PLACEHOLDER}],
+                "max_tokens": self.max_tokens,
+            }
+            if self.stream:
+                payload["stream"] = True
+                if self.stream_usage:
+                    payload["stream_options"] = {"include_usage": True}
+            prefix, suffix = json.dumps(payload).split(json.dumps(PLACEHOLDER))
+
+            url = self.endpoint
+            if self.azure and "/deployments" not in url:
+                url = f"{url}/deployments/{model}"
+            url = f"{url}/chat/completions"
+
+            template = (prefix.encode(), suffix.encode(), url)
+            self.templates[model] = template
+        return template
+
+    async def chat_completions(
+        self, model: str, message: str, start_time: float
+    ) -> Parsed:
+        prefix, suffix, url = self.template(model)
+        request = self.http_client.build_request(
+            "POST",
+            url,
+            content=prefix + json.dumps(message).encode() + suffix,
+            headers=self.headers,
+            params=self.params,
+        )
+
+        response = await self.send(request)
+        try:
+            if self.stream:
+                return await self.read_stream(response, start_time)
+            return self.read_response(await response.aread())
+        finally:
+            await response.aclose()
+
+    async def send(self, request: httpx.Request) -> httpx.Response:
+        for retries in range(MAX_RETRIES + 1):
+            remaining = MAX_RETRIES - retries
+            try:
+                response = await self.http_client.send(request, stream=True)
+            except httpx.TimeoutException as e:
+                if remaining:
+                    await asyncio.sleep(self.retry_delay(retries))
+                    continue
+                raise APITimeoutError(request=request) from e
+            except httpx.TransportError as e:
+                if remaining:
+                    await asyncio.sleep(self.retry_delay(retries))
+                    continue
+                raise APIConnectionError(request=request) from e
+
+            if response.is_success:
+                return response
+
+            await response.aread()
+            await response.aclose()
+            if remaining and self.should_retry(response):
+                await asyncio.sleep(self.retry_delay(retries, response.headers))
+                continue
+            response.raise_for_status()
+
+    def should_retry(self, response: httpx.Response) -> bool:
+        should_retry_header = response.headers.get("x-should-retry")
+        if should_retry_header in ("true", "false"):
+            return should_retry_header == "true"
+        return response.status_code in (408, 409, 429) or response.status_code >= 500
+
+    def retry_delay(
+        self, retries: int, headers: Optional[httpx.Headers] = None
+    ) -> float:
+        retry_after = None
+        if headers is not None:
+            try:
+                if "retry-after-ms" in headers:
+                    retry_after = float(headers["retry-after-ms"]) / 1000
+                elif "retry-after" in headers:
+                    retry_after = float(headers["retry-after"])
+            except ValueError:
+                pass
+        if retry_after is not None and 0 < retry_after <= 60:
+            return retry_after
+
+        delay = min(INITIAL_RETRY_DELAY * pow(2.0, retries), MAX_RETRY_DELAY)
+        return delay * (1 - 0.25 * random.random())
+
+    def read_response(self, content: bytes) -> Parsed:
+        result = json_loads(content)
+        choices = result.get("choices") or [{}]
+        message = choices[0].get("message") or {}
+        return (
+            result.get("usage"),
+            [message.get("content") or ""],
+            choices[0].get("finish_reason"),
+            None,
+        )
+
+    async def read_stream(self, response: httpx.Response, start_time: float) -> Parsed:
+        ttft = None
+        content = []
+        usage = None
+        finish_reason = None
+        async for line in response.aiter_lines():
+            if not line.startswith("data:"):
+                continue
+            data = line[5:].strip()
+            if data == "[DONE]":
+                break
+
+            chunk = json_loads(data)
+            if chunk.get("error"):
+                raise APIError(
+                    message=chunk["error"].get(
+                        "message", "An error occurred during streaming"
+                    ),
+                    request=response.request,
+                    body=chunk["error"],
+                )
+            if chunk.get("usage"):
+                usage = chunk["usage"]
+            for choice in chunk.get("choices") or []:
+                delta = choice.get("delta") or {}
+                if delta.get("content"):
+                    if ttft is None:
+                        ttft = time.perf_counter() - start_time
+                    content.append(delta["content"])
+                if choice.get("finish_reason"):
+                    finish_reason = choice["finish_reason"]
+
+        return usage, content, finish_reason, ttft
@@ -2,7 +2,7 @@ import asyncio
 from rich.console import Console
 from rich.table import Table
 from rich.live import Live
-from typing import Optional
+from typing import Any, Dict, Optional
 
 from .metrics_tracker import MetricsTracker
 
@@ -15,28 +15,53 @@ class LiveMonitor:
         self.console = console or Console()
         self.live = Live(console=self.console, refresh_per_second=4)
 
-    def create_table(self) -> Table:
-        table = Table(show_header=True, header_style="bold magenta")
+    def create_table(self, title: Optional[str] = None) -> Table:
+        table = Table(title=title, show_header=True, header_style="bold magenta")
         table.add_column("Metric", style="dim", width=20)
         table.add_column("Value")
         return table
 
-    async def update_table(self, table: Table) -> None:
-        metrics = await self.metrics_tracker.get_metrics()
+    async def update_table(self, table: Table, current_phase: bool = False) -> None:
+        # While running show the current phase, the headline excludes warm-up
+        metrics = (
+            await self.metrics_tracker.get_current_phase_metrics()
+            if current_phase
+            else await self.metrics_tracker.get_metrics()
+        )
         table.rows = []  # Clear existing rows
         for key, value in metrics.items():
             table.add_row(key.replace("_", " ").title(), str(value))
 
+    def create_phase_table(self, phases: Dict[str, Dict[str, Any]]) -> Table:
+        table = Table(title="Phases", show_header=True, header_style="bold magenta")
+        table.add_column("Metric", style="dim", width=20)
+        for name, metrics in phases.items():
+            table.add_column(f"{name} (warm-up)" if metrics["warmup"] else name)
+
+        keys = [key for key in next(iter(phases.values())) if key != "warmup"]
+        for key in keys:
+            table.add_row(
+                key.replace("_", " ").title(),
+                *(str(metrics[key]) for metrics in phases.values()),
+            )
+        return table
+
     async def monitor_metrics(self, update_interval: int = 1) -> None:
         with self.live as live:
             while not await self.metrics_tracker.is_test_complete():
-                table = self.create_table()
-                await self.update_table(table)
+                table = self.create_table(f"Phase: {self.metrics_tracker.phase}")
+                await self.update_table(table, current_phase=True)
                 live.update(table)
                 await asyncio.sleep(update_interval)
 
     async def final_update(self) -> None:
         # This is called once the test is complete to do a final update of the table
-        table = self.create_table()
+        # The live display has stopped by now, so print the headline table
+        table = self.create_table("Headline (excluding warm-up)")
         await self.update_table(table)
-        self.live.update(table)
+        self.console.print(table)
+
+        # Headline metrics exclude warm-up, so show every phase side by side
+        phases = await self.metrics_tracker.get_phase_metrics()
+        if len(phases) > 1 or any(m["warmup"] for m in phases.values()):
+            self.console.print(self.create_phase_table(phases))
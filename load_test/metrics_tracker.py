@@ -1,54 +1,207 @@
 import asyncio
 import time
-from typing import Dict, Any, Union, List
+from typing import Dict, Any, Union, List, Optional
 import numpy as np
 
 
-class MetricsTracker:
-    def __init__(self):
-        self.lock = asyncio.Lock()
+class MetricsWindow:
+    def __init__(self, name: str, warmup: bool = False, active_calls: int = 0):
+        self.name = name
+        self.warmup = warmup
         self.start_time = time.time()
-        self.test_complete = False
+        self.end_time: Optional[float] = None
         self.response_times: List[float] = []
-        self.metrics: Dict[str, Union[int, float]] = {
-            "active_calls": 0,
+        self.ttfts: List[float] = []
+        self.metrics: Dict[str, Optional[Union[int, float]]] = {
+            "active_calls": active_calls,
             "successful_calls": 0,
             "unsuccessful_calls": 0,
             "total_calls": 0,
-            "max_concurrent_calls": 0,
+            "max_concurrent_calls": active_calls,
             "total_input_tokens": 0,
             "total_output_tokens": 0,
             "total_token_count": 0,
             "rate_limit_calls": 0,
+            "good_calls": 0,
+            "good_token_count": 0,
             "avg_response_time": 0,
+            # TTFT is only measured when streaming
+            "avg_ttft": None,
         }
 
-    async def update_metric(self, metric_name: str, value: int):
+    @property
+    def elapsed_time(self) -> float:
+        return (self.end_time or time.time()) - self.start_time
+
+
+def summarise(
+    metrics: Dict[str, Union[int, float]],
+    response_times: List[float],
+    elapsed_time: float,
+    ttfts: List[float],
+    slo: bool = False,
+) -> Dict[str, Any]:
+    elapsed_min = elapsed_time / 60
+
+    # TTFT is only measured when streaming
+    ttft_p50 = np.percentile(ttfts, 50).round(3) if ttfts else None
+    ttft_p90 = np.percentile(ttfts, 90).round(3) if ttfts else None
+
+    # limit to 2 decimal places
+
+    tokens_per_minute = int(
+        (metrics["total_token_count"] / elapsed_min) if elapsed_time > 0 else 0
+    )
+    requests_per_minute = int(
+        (metrics["successful_calls"] / elapsed_min) if elapsed_time > 0 else 0
+    )
+    output_tokens_per_second = (
+        round(metrics["total_output_tokens"] / elapsed_time, 2)
+        if elapsed_time > 0
+        else 0
+    )
+    # Goodput only counts requests that met the latency and TTFT SLOs, without
+    # an SLO it would just repeat throughput so it is left unset
+    goodput_requests_per_minute = goodput_tokens_per_minute = None
+    if slo:
+        goodput_requests_per_minute = int(
+            (metrics["good_calls"] / elapsed_min) if elapsed_time > 0 else 0
+        )
+        goodput_tokens_per_minute = int(
+            (metrics["good_token_count"] / elapsed_min) if elapsed_time > 0 else 0
+        )
+    else:
+        metrics = dict(metrics, good_calls=None, good_token_count=None)
+
+    if len(response_times) == 0:
+        return dict(
+            metrics,
+            p50=0,
+            p90=0,
+            p99=0,
+            ttft_p50=ttft_p50,
+            ttft_p90=ttft_p90,
+            tokens_per_minute=tokens_per_minute,
+            requests_per_minute=requests_per_minute,
+            output_tokens_per_second=output_tokens_per_second,
+            goodput_requests_per_minute=goodput_requests_per_minute,
+            goodput_tokens_per_minute=goodput_tokens_per_minute,
+        )
+
+    p50 = np.percentile(response_times, 50).round(3)
+    p90 = np.percentile(response_times, 90).round(3)
+    p99 = np.percentile(response_times, 99).round(3)
+
+    return dict(
+        metrics,
+        p50=p50,
+        p90=p90,
+        p99=p99,
+        ttft_p50=ttft_p50,
+        ttft_p90=ttft_p90,
+        tokens_per_minute=tokens_per_minute,
+        requests_per_minute=requests_per_minute,
+        output_tokens_per_second=output_tokens_per_second,
+        goodput_requests_per_minute=goodput_requests_per_minute,
+        goodput_tokens_per_minute=goodput_tokens_per_minute,
+    )
+
+
+class MetricsTracker:
+    def __init__(
+        self,
+        phase: str = "main",
+        warmup: bool = False,
+        slo_latency: Optional[float] = None,
+        slo_ttft: Optional[float] = None,
+    ):
+        self.lock = asyncio.Lock()
+        self.slo_latency = slo_latency
+        self.slo_ttft = slo_ttft
+        self.test_complete = False
+        self.windows: Dict[str, MetricsWindow] = {}
+        self.window = self._open_window(phase, warmup)
+        self.default_window = self.window
+
+    def _open_window(
+        self, phase: str, warmup: bool, active_calls: int = 0
+    ) -> MetricsWindow:
+        if phase in self.windows:
+            raise ValueError(f"Phase {phase} already exists.")
+        window = MetricsWindow(phase, warmup, active_calls)
+        self.windows[phase] = window
+        return window
+
+    @property
+    def metrics(self) -> Dict[str, Union[int, float]]:
+        return self.window.metrics
+
+    @property
+    def phase(self) -> str:
+        return self.window.name
+
+    @property
+    def has_slo(self) -> bool:
+        return self.slo_latency is not None or self.slo_ttft is not None
+
+    def meets_slo(self, response_time: float, ttft: float) -> bool:
+        if self.slo_latency is not None and response_time > self.slo_latency:
+            return False
+        if self.slo_ttft is not None and ttft > self.slo_ttft:
+            return False
+        return True
+
+    async def start_phase(self, phase: str, warmup: bool = False) -> None:
         async with self.lock:
-            if metric_name in self.metrics:
+            previous = self.window
+            previous.end_time = time.time()
+
+            # Discard the default window if no phase ever ran in it, empty
+            # scenario phases such as pauses are kept in the report
+            if (
+                previous is self.default_window
+                and previous.metrics["total_calls"] == 0
+                and previous.metrics["active_calls"] == 0
+            ):
+                del self.windows[previous.name]
+
+            # Calls still in flight carry over into the new window's concurrency
+            self.window = self._open_window(
+                phase, warmup, previous.metrics["active_calls"]
+            )
+
+    # Metrics are recorded against the phase a request started in, so that
+    # requests straddling a phase boundary do not leak into the next window
+    async def update_metric(
+        self, metric_name: str, value: int, phase: Optional[str] = None
+    ):
+        async with self.lock:
+            window = self.windows.get(phase, self.window)
+            metrics = window.metrics
+            if metric_name in metrics:
 
                 if metric_name == "active_calls":
-                    self.metrics["max_concurrent_calls"] = max(
-                        self.metrics["max_concurrent_calls"],
-                        self.metrics["active_calls"],
+                    # Concurrency is instantaneous, so it always tracks the current window
+                    metrics = self.window.metrics
+                    metrics["max_concurrent_calls"] = max(
+                        metrics["max_concurrent_calls"],
+                        metrics["active_calls"],
                     )
-                    self.metrics["active_calls"] += value
+                    metrics["active_calls"] += value
                 elif metric_name == "avg_response_time":
-                    self.metrics["avg_response_time"] = (
-                        self.metrics["avg_response_time"]
-                        * self.metrics["successful_calls"]
+                    metrics["avg_response_time"] = (
+                        metrics["avg_response_time"] * metrics["successful_calls"]
                         + value
-                    ) / (self.metrics["successful_calls"] + 1)
-                    self.metrics["successful_calls"] += 1
-                    self.response_times.append(value)
-                elif metric_name == "total_token_count":
-                    self.metrics["total_token_count"] += value
-                    self.metrics["total_output_tokens"] = (
-                        self.metrics["total_token_count"]
-                        - self.metrics["total_input_tokens"]
-                    )
+                    ) / (metrics["successful_calls"] + 1)
+                    metrics["successful_calls"] += 1
+                    window.response_times.append(value)
+                elif metric_name == "avg_ttft":
+                    metrics["avg_ttft"] = (
+                        (metrics["avg_ttft"] or 0) * len(window.ttfts) + value
+                    ) / (len(window.ttfts) + 1)
+                    window.ttfts.append(value)
                 else:
-                    self.metrics[metric_name] += value
+                    metrics[metric_name] += value
 
             else:
                 raise KeyError(f"Metric {metric_name} does not exist.")
@@ -67,48 +220,63 @@ class MetricsTracker:
             else:
                 raise KeyError(f"Metric {metric_name} does not exist.")
 
+    # Headline metrics aggregate every phase except warm-up
     async def get_metrics(self) -> Dict[str, Any]:
         async with self.lock:
-            elapsed_time = time.time() - self.start_time
-            elapsed_min = elapsed_time / 60
+            windows = [w for w in self.windows.values() if not w.warmup]
 
-            # limit to 2 decimal places
+            metrics = MetricsWindow("headline").metrics
+            response_times: List[float] = []
+            ttfts: List[float] = []
+            elapsed_time = 0.0
+            for window in windows:
+                for key, value in window.metrics.items():
+                    if key == "max_concurrent_calls":
+                        metrics[key] = max(metrics[key], value)
+                    elif key not in ("avg_response_time", "avg_ttft"):
+                        metrics[key] += value
+                response_times.extend(window.response_times)
+                ttfts.extend(window.ttfts)
+                elapsed_time += window.elapsed_time
 
-            tokens_per_minute = int(
-                (self.metrics["total_token_count"] / elapsed_min)
-                if elapsed_time > 0
-                else 0
-            )
-            requests_per_minute = int(
-                (self.metrics["successful_calls"] / elapsed_min)
-                if elapsed_time > 0
-                else 0
-            )
+            metrics["active_calls"] = self.window.metrics["active_calls"]
+            if response_times:
+                metrics["avg_response_time"] = sum(response_times) / len(response_times)
+            if ttfts:
+                metrics["avg_ttft"] = sum(ttfts) / len(ttfts)
 
-            if len(self.response_times) == 0:
-                return dict(
-                    self.metrics,
-                    p50=0,
-                    p90=0,
-                    p99=0,
-                    tokens_per_minute=tokens_per_minute,
-                    requests_per_minute=requests_per_minute,
-                )
+            return summarise(metrics, response_times, elapsed_time, ttfts, self.has_slo)
 
-            p50 = np.percentile(self.response_times, 50).round(3)
-            p90 = np.percentile(self.response_times, 90).round(3)
-            p99 = np.percentile(self.response_times, 99).round(3)
-
-            return dict(
-                self.metrics,
-                p50=p50,
-                p90=p90,
-                p99=p99,
-                tokens_per_minute=tokens_per_minute,
-                requests_per_minute=requests_per_minute,
+    async def get_current_phase_metrics(self) -> Dict[str, Any]:
+        async with self.lock:
+            return summarise(
+                self.window.metrics,
+                self.window.response_times,
+                self.window.elapsed_time,
+                self.window.ttfts,
+                self.has_slo,
             )
 
+    async def get_phase_metrics(self) -> Dict[str, Dict[str, Any]]:
+        async with self.lock:
+            return {
+                name: dict(
+                    summarise(
+                        window.metrics,
+                        window.response_times,
+                        window.elapsed_time,
+                        window.ttfts,
+                        self.has_slo,
+                    ),
+                    warmup=window.warmup,
+                )
+                for name, window in self.windows.items()
+            }
+
     async def set_test_complete(self, value: bool = True) -> None:
+        async with self.lock:
+            if value and self.window.end_time is None:
+                self.window.end_time = time.time()
         self.test_complete = value
 
     async def is_test_complete(self) -> bool:
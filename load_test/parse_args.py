@@ -1,5 +1,9 @@
 import argparse
-from typing import NamedTuple, Optional
+from datetime import date, datetime
+from typing import List, NamedTuple, Optional
+
+# Azure OpenAI accepts stream_options from API version 2024-09-01-preview onwards
+AZURE_STREAM_USAGE_SINCE = date(2024, 9, 1)
 
 
 class CommandLineArgs(NamedTuple):
@@ -12,6 +16,35 @@ class CommandLineArgs(NamedTuple):
     max_tokens: Optional[int]
     client_type: str
     api_version: str
+    output: Optional[str]
+    scenario: Optional[str]
+    stream: bool
+    stream_usage: bool
+    fast_path: bool
+    unbounded_pool: bool
+    slo_latency: Optional[float]
+    slo_ttft: Optional[float]
+
+
+class CompareArgs(NamedTuple):
+    runs: List[str]
+    max_latency_regression: Optional[float]
+    max_ttft_regression: Optional[float]
+    max_throughput_drop: Optional[float]
+    max_error_rate_increase: Optional[float]
+    bootstrap_iterations: int
+    confidence: float
+    seed: Optional[int]
+
+
+def supports_stream_usage(api_version: str) -> bool:
+    # Versions look like 2024-10-21 or 2024-09-01-preview, anything else is
+    # left off so an unknown version never fails every streamed request
+    try:
+        released = datetime.strptime(api_version[:10], "%Y-%m-%d").date()
+    except ValueError:
+        return False
+    return released >= AZURE_STREAM_USAGE_SINCE
 
 
 def parse() -> CommandLineArgs:
@@ -89,6 +122,64 @@ def parse() -> CommandLineArgs:
         default=False,
         help="Use a custom API, if this is selected then you have to provide the request structure in the input.json file and the response structure in the output.json file.",
     )
+    parser.add_argument(
+        "-st",
+        "--stream",
+        type=bool,
+        action=argparse.BooleanOptionalAction,
+        default=False,
+        help="Stream responses to measure time to first token. Not supported by the custom client.",
+    )
+    parser.add_argument(
+        "--stream-usage",
+        type=bool,
+        action=argparse.BooleanOptionalAction,
+        default=None,
+        help="Request a usage chunk (stream_options) when streaming, otherwise token counts fall back to TikToken. "
+        "Defaults to on, except for Azure OpenAI API versions before 2024-09-01(-preview) which reject stream_options.",
+    )
+    parser.add_argument(
+        "-fp",
+        "--fast-path",
+        type=bool,
+        action=argparse.BooleanOptionalAction,
+        default=False,
+        help="Post pre-serialised requests over httpx and parse only the fields needed, bypassing the OpenAI SDK. "
+        "Decodes with orjson (in requirements.txt, or the poetry 'fast' extra) and falls back to the slower stdlib json if it is missing.",
+    )
+    parser.add_argument(
+        "--unbounded-pool",
+        type=bool,
+        action=argparse.BooleanOptionalAction,
+        default=False,
+        help="Lift the OpenAI SDK's default connection limits (100 connections, 20 keep-alive) so only the concurrency level caps calls in flight.",
+    )
+    parser.add_argument(
+        "--slo-latency",
+        type=float,
+        default=None,
+        help="Latency SLO in seconds. Only requests within it count towards goodput.",
+    )
+    parser.add_argument(
+        "--slo-ttft",
+        type=float,
+        default=None,
+        help="Time to first token SLO in seconds. Only requests within it count towards goodput.",
+    )
+    parser.add_argument(
+        "-s",
+        "--scenario",
+        type=str,
+        default=None,
+        help="TOML scenario file describing ordered test phases. Overrides --concurrency-level and --duration.",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        type=str,
+        default=None,
+        help="Write the final metrics summary to this JSON file, for use with 'compare'.",
+    )
 
     args = parser.parse_args()
 
@@ -110,6 +201,10 @@ def parse() -> CommandLineArgs:
     elif args.custom:
         client_type = "custom"
 
+    stream_usage = args.stream_usage
+    if stream_usage is None:
+        stream_usage = client_type != "azure" or supports_stream_usage(args.api_version)
+
     return CommandLineArgs(
         endpoint=args.endpoint,
         api_key=args.api_key,
@@ -120,4 +215,98 @@ def parse() -> CommandLineArgs:
         max_tokens=args.max_tokens,
         client_type=client_type,
         api_version=args.api_version,
+        output=args.output,
+        scenario=args.scenario,
+        stream=args.stream,
+        stream_usage=stream_usage,
+        fast_path=args.fast_path,
+        unbounded_pool=args.unbounded_pool,
+        slo_latency=args.slo_latency,
+        slo_ttft=args.slo_ttft,
+    )
+
+
+def parse_compare(argv: Optional[List[str]] = None) -> CompareArgs:
+    parser = argparse.ArgumentParser(
+        prog="main.py compare",
+        description=(
+            "Compare test runs against a baseline and gate on regressions. Exits 1 when a threshold "
+            "is breached, 2 on usage errors or when a run cannot be loaded (missing, unreadable or "
+            "malformed file), and 3 when a threshold has no data in one of the runs."
+        ),
+    )
+    parser.add_argument(
+        "runs",
+        type=str,
+        nargs="+",
+        help=(
+            "Test log files or JSON summaries (from --output), not mixed. The first run is the baseline. "
+            "Log files give per-request samples with bootstrap confidence intervals and measure throughput "
+            "from the first request to the last response. Summaries only hold point values, with throughput "
+            "as whole requests/tokens per minute over the summed non-warm-up phase durations."
+        ),
+    )
+    parser.add_argument(
+        "--max-latency-regression",
+        type=float,
+        default=None,
+        help="Fail if p50/p90/p99 latency increases by more than this percentage.",
+    )
+    parser.add_argument(
+        "--max-ttft-regression",
+        type=float,
+        default=None,
+        help="Fail if p50/p90 time to first token increases by more than this percentage.",
+    )
+    parser.add_argument(
+        "--max-throughput-drop",
+        type=float,
+        default=None,
+        help="Fail if requests or tokens per minute drop by more than this percentage.",
+    )
+    parser.add_argument(
+        "--max-error-rate-increase",
+        type=float,
+        default=None,
+        help="Fail if the error rate increases by more than this many percentage points.",
+    )
+    parser.add_argument(
+        "--bootstrap-iterations",
+        type=int,
+        default=1000,
+        help="Number of bootstrap resamples used for confidence intervals.",
+    )
+    parser.add_argument(
+        "--confidence",
+        type=float,
+        default=0.95,
+        help="Confidence level of the bootstrap intervals. Default is 0.95.",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=None,
+        help="Random seed for reproducible bootstrap intervals.",
+    )
+
+    args = parser.parse_args(argv)
+
+    if len(args.runs) < 2:
+        parser.error("At least two runs are required to compare")
+    if len({run.endswith(".json") for run in args.runs}) > 1:
+        parser.error(
+            "Cannot mix JSON summaries and log files, they measure throughput differently"
+        )
+    if not 0 < args.confidence < 1:
+        parser.error("--confidence must be between 0 and 1")
+
+    return CompareArgs(
+        runs=args.runs,
+        max_latency_regression=args.max_latency_regression,
+        max_ttft_regression=args.max_ttft_regression,
+        max_throughput_drop=args.max_throughput_drop,
+        max_error_rate_increase=args.max_error_rate_increase,
+        bootstrap_iterations=args.bootstrap_iterations,
+        confidence=args.confidence,
+        seed=args.seed,
     )
@@ -0,0 +1,146 @@
+import argparse
+import random
+import tomllib
+from datetime import timedelta
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from .util import (
+    parse_duration,
+    random_prompt,
+    generate_random_string,
+    generate_template_string,
+)
+
+WORKLOADS = ("prompts", "template", "random")
+
+
+# Generated workloads draw from a pool built when the scenario loads, so prompt
+# generation never runs on the event loop while requests are in flight
+PROMPT_POOL_SIZE = 100
+
+
+class Phase(NamedTuple):
+    name: str
+    duration: Optional[timedelta]
+    concurrency: Optional[int] = None
+    start_concurrency: Optional[int] = None
+    rate: Optional[float] = None
+    workload: str = "prompts"
+    prompt_tokens: Optional[int] = None
+    warmup: bool = False
+    prompts: Tuple[str, ...] = ()
+
+    # Ramps interpolate linearly from start_concurrency to concurrency
+    def concurrency_at(self, elapsed: float) -> int:
+        if self.start_concurrency is None or self.duration is None:
+            return self.concurrency
+        progress = min(elapsed / self.duration.total_seconds(), 1)
+        return round(
+            self.start_concurrency
+            + (self.concurrency - self.start_concurrency) * progress
+        )
+
+    def prompt(self) -> str:
+        if self.prompts:
+            return random.choice(self.prompts)
+        return random_prompt()
+
+
+def prompt_pool(workload: str, prompt_tokens: Optional[int]) -> Tuple[str, ...]:
+    match workload:
+        case "template":
+            generate = generate_template_string
+        case "random":
+            generate = generate_random_string
+        case _:
+            return ()
+    return tuple(generate(prompt_tokens) for _ in range(PROMPT_POOL_SIZE))
+
+
+def get_field(name: str, raw: Dict[str, Any], key: str, types: tuple) -> Any:
+    value = raw.get(key)
+    # bool is a subclass of int, but never a valid count or rate
+    if value is not None and (
+        not isinstance(value, types) or (bool not in types and isinstance(value, bool))
+    ):
+        expected = " or ".join(t.__name__ for t in types)
+        raise ValueError(
+            f"Phase {name} {key} must be {expected}, got {type(value).__name__}"
+        )
+    return value
+
+
+def parse_phase(index: int, raw: Dict[str, Any], last: bool) -> Phase:
+    name = get_field(f"#{index + 1}", raw, "name", (str,)) or f"phase-{index + 1}"
+
+    duration_str = get_field(name, raw, "duration", (str,))
+    try:
+        duration = parse_duration(duration_str)
+    except argparse.ArgumentTypeError as e:
+        raise ValueError(f"Phase {name} duration: {e}") from e
+    if duration is None and not last:
+        raise ValueError(f"Phase {name} needs a duration, only the last can be open")
+    if duration is not None and duration.total_seconds() <= 0:
+        raise ValueError(f"Phase {name} duration must be positive")
+
+    concurrency = get_field(name, raw, "concurrency", (int,))
+    rate = get_field(name, raw, "rate", (int, float))
+    if (concurrency is None) == (rate is None):
+        raise ValueError(f"Phase {name} must set exactly one of concurrency or rate")
+    if rate is not None and rate <= 0:
+        raise ValueError(f"Phase {name} rate must be positive")
+    if concurrency is not None and concurrency < 0:
+        raise ValueError(f"Phase {name} concurrency must not be negative")
+
+    start_concurrency = get_field(name, raw, "start_concurrency", (int,))
+    if start_concurrency is not None and concurrency is None:
+        raise ValueError(f"Phase {name} start_concurrency requires concurrency")
+    if start_concurrency is not None and start_concurrency < 0:
+        raise ValueError(f"Phase {name} start_concurrency must not be negative")
+
+    workload = get_field(name, raw, "workload", (str,)) or "prompts"
+    if workload not in WORKLOADS:
+        raise ValueError(f"Unsupported workload for phase {name}: {workload}")
+    prompt_tokens = get_field(name, raw, "prompt_tokens", (int,))
+    if prompt_tokens is not None and prompt_tokens <= 0:
+        raise ValueError(f"Phase {name} prompt_tokens must be positive")
+    if workload != "prompts" and prompt_tokens is None:
+        raise ValueError(f"Phase {name} workload {workload} requires prompt_tokens")
+
+    warmup = get_field(name, raw, "warmup", (bool,))
+
+    return Phase(
+        name=name,
+        duration=duration,
+        concurrency=concurrency,
+        start_concurrency=start_concurrency,
+        rate=rate,
+        workload=workload,
+        prompt_tokens=prompt_tokens,
+        warmup=bool(warmup),
+        prompts=prompt_pool(workload, prompt_tokens),
+    )
+
+
+def load_scenario(path: str) -> List[Phase]:
+    with open(path, "rb") as f:
+        scenario = tomllib.load(f)
+
+    raw_phases = scenario.get("phases", [])
+    if not isinstance(raw_phases, list) or not all(
+        isinstance(raw, dict) for raw in raw_phases
+    ):
+        raise ValueError(f"Scenario {path} phases must be a [[phases]] array of tables")
+    if not raw_phases:
+        raise ValueError(f"Scenario {path} does not define any phases")
+
+    phases = [
+        parse_phase(i, raw, i == len(raw_phases) - 1)
+        for i, raw in enumerate(raw_phases)
+    ]
+
+    names = [phase.name for phase in phases]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Scenario {path} has duplicate phase names")
+
+    return phases
@@ -6,6 +6,7 @@ from typing import Optional, List
 import wonderwords
 import tiktoken
 import random
+from functools import lru_cache
 from .prompts import prompts
 
 
@@ -47,9 +48,18 @@ def parse_duration(duration_str: Optional[str]) -> Optional[timedelta]:
         raise ValueError(f"Unsupported time unit: {unit}")
 
 
+# Filtering the word lists is slow, so do it once per part-of-speech selection
+@lru_cache(maxsize=None)
+def word_list(*parts_of_speech: str) -> List[str]:
+    r = wonderwords.RandomWord()
+    if parts_of_speech:
+        return r.filter(include_parts_of_speech=list(parts_of_speech))
+    return r.filter()
+
+
 # Function to generate a test string with a target token count
 def generate_random_string(target_token_count: int):
-    r = wonderwords.RandomWord()
+    words = word_list("adjectives", "nouns")
     encoding = tiktoken.get_encoding("cl100k_base")
 
     string_builder = ""
@@ -58,21 +68,14 @@ def generate_random_string(target_token_count: int):
     estimated_word_count = int(target_token_count / avg_tokens_per_word)
 
     # Generate the estimated number of words
-    words = [
-        r.word(include_parts_of_speech=["adjectives", "nouns"])
-        for _ in range(estimated_word_count)
-    ]
-
-    string_builder = " ".join(words)
+    string_builder = " ".join(random.choices(words, k=estimated_word_count))
 
     # Refine the string to meet the exact token count
     while True:
         token_count = len(encoding.encode(string_builder))
 
         if token_count < target_token_count:
-            string_builder += " " + r.word(
-                include_parts_of_speech=["adjectives", "nouns"]
-            )
+            string_builder += " " + random.choice(words)
 
         elif token_count > target_token_count:
             string_builder = " ".join(string_builder.split(" ")[:-1])
@@ -84,7 +87,6 @@ def generate_random_string(target_token_count: int):
 
 
 def generate_template_string(target_token_count: int):
-    r = wonderwords.RandomWord()
     templates = [
         "Write a brief summary about {topic}.",
         "Explain the concept of {concept} in simple terms.",
@@ -139,7 +141,7 @@ def generate_template_string(target_token_count: int):
     # Adjust to meet target token count. Assuming 1 token per word for simplicity
     words = template.split()
     while len(words) < target_token_count:
-        words.append(r.word())
+        words.append(random.choice(word_list()))
     while len(words) > target_token_count:
         words.pop()
 
@@ -1,8 +1,11 @@
 import asyncio
-from load_test import main_async
+import sys
+from load_test import main_async, compare_main
 
 
 def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "compare":
+        sys.exit(compare_main(sys.argv[2:]))
     asyncio.run(main_async())
 
 